@@ -1,14 +1,46 @@
+import operator
+import os
+import random
+import sys
+import time
+
+if '--bench' in sys.argv:
+    # ヘッドレスでのフレーム時間計測(kivy のインポート前に設定する)
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    os.environ.setdefault('KIVY_GL_BACKEND', 'mock')
+
 import kivy
+from kivy.config import Config
+
+if '--bench' in sys.argv:
+    # フレームレート上限(maxfps=60)を外さないと dt が 16.7ms に張り付く
+    Config.set('graphics', 'maxfps', '0')
+
 from kivy.app import App
+from kivy.clock import Clock
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.label import Label
 from kivy.uix.button import Button
-from kivy.uix.popup import Popup
 from kivy.uix.textinput import TextInput
 
 kivy.require('2.0.0')
 
+# ボタン名 -> 演算 (divide は b == 0 で ZeroDivisionError)
+OPERATIONS = {
+    'add': operator.add,
+    'subtract': operator.sub,
+    'multiply': operator.mul,
+    'divide': operator.floordiv,
+    'and': operator.and_,
+    'or': operator.or_,
+    'xor': operator.xor,
+}
+
+# 入力値キャッシュの状態
+EMPTY = object()
+INVALID = object()
+
 
 class BinaryInput(TextInput):
     '''0/1 以外の文字を自動で除去するTextInput'''
@@ -20,6 +52,7 @@ class BinaryInput(TextInput):
 class BinaryCalculatorApp(App):
     def build(self):
         self.title = "Binary Calculator"
+        self.stats = {"errors": 0}
 
         root = BoxLayout(orientation='vertical', padding=10, spacing=10)
 
@@ -31,6 +64,11 @@ class BinaryCalculatorApp(App):
             hint_text='2 (binary)', multiline=False, font_size=24
         )
 
+        # 解析済みの入力値(text が変わったら破棄)
+        self._values = {}
+        self.entry1.bind(text=self._invalidate)
+        self.entry2.bind(text=self._invalidate)
+
         # 結果表示ラベル
         self.result_label = Label(text='= ', font_size=28, size_hint=(1, 0.4))
 
@@ -51,11 +89,20 @@ class BinaryCalculatorApp(App):
             btn.bind(on_press=lambda inst, operation=op: self.on_button(operation))
             ops_layout.add_widget(btn)
 
+        # エラー表示用ステータス行(モーダルにせず、一定時間後に消す)
+        self.error_label = Label(
+            text='', font_size=18, color=(1, 0.42, 0.42, 1), size_hint=(1, 0.15)
+        )
+        self._clear_error = Clock.create_trigger(
+            lambda dt: setattr(self.error_label, 'text', ''), 2
+        )
+
         # ウィジェットを配置
         root.add_widget(self.entry1)
         root.add_widget(self.entry2)
         root.add_widget(ops_layout)
         root.add_widget(self.result_label)
+        root.add_widget(self.error_label)
 
         return root
 
@@ -66,33 +113,19 @@ class BinaryCalculatorApp(App):
             self.result_label.text = '= '
             return
 
-        a_text = self.entry1.text.strip()
-        b_text = self.entry2.text.strip()
+        a = self.operand(self.entry1)
+        b = self.operand(self.entry2)
 
         # 空欄チェック
-        if not a_text or not b_text:
+        if a is EMPTY or b is EMPTY:
             return self.show_error("0or1")
 
         try:
-            a = int(a_text, 2)
-            b = int(b_text, 2)
-
-            if operation == 'add':
-                res = a + b
-            elif operation == 'subtract':
-                res = a - b
-            elif operation == 'multiply':
-                res = a * b
-            elif operation == 'divide':
-                if b == 0:
-                    raise ZeroDivisionError
-                res = a // b
-            elif operation == 'and':
-                res = a & b
-            elif operation == 'or':
-                res = a | b
-            elif operation == 'xor':
-                res = a ^ b
+            # int(..,2) の失敗
+            if a is INVALID or b is INVALID:
+                raise ValueError
+
+            res = OPERATIONS[operation](a, b)
 
             # 負数対応: '-' を付与してから2進文字列化
             sign = '-' if res < 0 else ''
@@ -105,14 +138,87 @@ class BinaryCalculatorApp(App):
             # int(..,2) の失敗もキャッチ
             self.show_error("Error.1")
 
+    def operand(self, entry):
+        '''入力欄の値を返す(解析結果はキャッシュする)'''
+        value = self._values.get(entry)
+        if value is None:
+            text = entry.text.strip()
+            if not text:
+                value = EMPTY
+            else:
+                try:
+                    value = int(text, 2)
+                except ValueError:
+                    value = INVALID
+            self._values[entry] = value
+        return value
+
+    def _invalidate(self, entry, text):
+        self._values.pop(entry, None)
+
     def show_error(self, message):
-        popup = Popup(
-            title='Error.3',
-            content=Label(text=message),
-            size_hint=(0.6, 0.4)
-        )
-        popup.open()
+        # ステータス行に表示し、一定時間後に消す(入力は止めない)
+        self.stats["errors"] += 1
+        self.error_label.text = message
+        self._clear_error.cancel()
+        self._clear_error()
+
+
+class BenchmarkApp(BinaryCalculatorApp):
+    '''1フレームに1回ボタンを押してフレーム時間と on_button の時間を測る'''
+    frames = 600
+    warmup = 10
+    bits = 20000    # 解析コストが見える大きさの入力
+
+    def on_start(self):
+        self.frame_times = []
+        self.press_times = []
+        self._ops = list(OPERATIONS)
+        self._step_count = 0
+        rnd = random.Random(0)
+        self._operands = [format(rnd.getrandbits(self.bits) | 1 << (self.bits - 1), 'b')
+                          for _ in range(8)]
+        self.entry2.text = self._operands[0]
+        Clock.schedule_interval(self._step, 0)
+
+    def _step(self, dt):
+        i = self._step_count
+        self._step_count += 1
+        if i % 4 == 0:
+            # 入力変更でキャッシュ無効化の経路も通す
+            self.entry1.text = self._operands[(i // 4) % len(self._operands)]
+        start = time.perf_counter()
+        self.on_button(self._ops[i % len(self._ops)])
+        elapsed = time.perf_counter() - start
+        if i >= self.warmup:
+            self.frame_times.append(dt)
+            self.press_times.append(elapsed)
+        if self._step_count >= self.frames + self.warmup:
+            self.stop()
+            return False
+
+
+def _summary(times):
+    times = sorted(times)
+    mean = sum(times) / len(times)
+    p95 = times[int(len(times) * 0.95) - 1]
+    return (f"mean {mean * 1000:.3f} ms, p95 {p95 * 1000:.3f} ms, "
+            f"max {times[-1] * 1000:.3f} ms")
+
+
+def run_benchmark():
+    app = BenchmarkApp()
+    app.run()
+    if not app.frame_times:
+        return 1
+    print(f"{len(app.frame_times)} frames, {app.bits}-bit operands, "
+          f"errors: {app.stats['errors']}")
+    print(f"  frame:     {_summary(app.frame_times)}")
+    print(f"  on_button: {_summary(app.press_times)}")
+    return 0
 
 
 if __name__ == '__main__':
+    if '--bench' in sys.argv:
+        sys.exit(run_benchmark())
     BinaryCalculatorApp().run()
\ No newline at end of file
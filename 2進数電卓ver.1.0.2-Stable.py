@@ -1,33 +1,289 @@
+import argparse
+import binascii
+import ctypes
+import json
+import mmap
+import operator
+import os
+import random
+import struct
 import sys
-from functools import partial
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont, QPalette, QColor
+import tempfile
+import time
+import tracemalloc
+from collections import deque, namedtuple
+from fractions import Fraction
+from functools import lru_cache, partial
+from itertools import islice
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFont, QPalette, QColor, QKeySequence
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
-    QLabel, QPushButton, QMessageBox, QStyleFactory, QSizePolicy
+    QLabel, QPushButton, QStyleFactory, QSizePolicy, QTabWidget, QShortcut,
+    QFileDialog
 )
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# file operand mode (bitwise ops on raw binary files)
+FILE_OPERATORS = ("and", "or", "xor")
+FILE_CHUNK_SIZE = 16 * 1024 * 1024
+
+# keyboard shortcuts (built once, not per key press)
+KEYMAP = {
+    Qt.Key_0: "0", Qt.Key_1: "1",
+    Qt.Key_Plus: "add", Qt.Key_Minus: "subtract",
+    Qt.Key_Asterisk: "multiply", Qt.Key_Slash: "divide",
+    Qt.Key_Equal: "equal", Qt.Key_Return: "equal", Qt.Key_Enter: "equal",
+    Qt.Key_Backspace: "back", Qt.Key_Delete: "clear",
+}
+
+# replay scripts: whitespace-separated key names, or keyboard characters
+KEY_NAMES = (
+    "and", "or", "xor", "back", "add", "subtract", "multiply", "divide",
+    "0", "1", "equal", "clear", "undo", "redo",
+)
+REPLAY_CHARS = {
+    "0": "0", "1": "1", "+": "add", "-": "subtract",
+    "*": "multiply", "/": "divide", "=": "equal",
+}
+
+# fixed-point mode: number of binary fractional bits (0 = integer floor division)
+DEFAULT_FRAC_BITS = 0
+
+# --verify: throughput baseline (machine-specific, gitignored) and allowed slowdown
+VERIFY_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "verify_baseline.json")
+VERIFY_TOLERANCE = 0.25
+
+# shared evaluation engine: results of evaluate() kept across all sessions.
+# Expressions longer than this (operand digits) are evaluated uncached, so
+# the cache holds at most about RESULT_CACHE_SIZE * RESULT_CACHE_MAX_CHARS digits.
+RESULT_CACHE_SIZE = 256
+RESULT_CACHE_MAX_CHARS = 4096
+
+# expressions are token tuples (operand, op, operand, ...): operand strings
+# are shared, display text is rendered from the tokens when shown
+DISPLAY_SYMBOLS = {
+    "EN": {"add": "+", "subtract": "-", "multiply": "×", "divide": "÷",
+           "and": "AND", "or": "OR", "xor": "XOR"},
+    "JP": {"add": "＋", "subtract": "－", "multiply": "×", "divide": "÷",
+           "and": "AND", "or": "OR", "xor": "XOR"},
+}
+CALC_OPERATORS = tuple(DISPLAY_SYMBOLS["EN"])
+EXPRESSION_OPERATORS = {sym: op for symbols in DISPLAY_SYMBOLS.values()
+                        for op, sym in symbols.items()}
+
+# undo/redo: immutable snapshots of the calculator fields. Strings are
+# shared by reference between snapshots, never copied.
+CalcState = namedtuple("CalcState", (
+    "current_value", "expression", "operator",
+    "waiting_for_operand", "last_result", "shown_expression", "show_equals",
+))
+HISTORY_LIMIT = 10000
+
+# result export/import: raw bytes, length-prefixed "packed" file, or hex text
+EXPORT_FORMATS = ("raw", "packed", "hex")
+EXPORT_MAGIC = b"BCAL"
+EXPORT_VERSION = 1
+# magic, version, flags (1 = negative, 2 = little-endian), frac_bits, length
+EXPORT_HEADER = struct.Struct("<4sBBIQ")
+EXPORT_CHUNK_SIZE = 1024 * 1024
+EXPORT_FILTER = "Packed (*.bcal);;Raw bytes (*.bin);;Hex (*.hex)"
+EXPORT_EXTENSIONS = {".bcal": "packed", ".bin": "raw", ".hex": "hex"}
+EXPORT_BYTEORDERS = ("big", "little")
+
+# digit keys repaint the display at most once per frame
+DISPLAY_FRAME_MS = 16
+
+# --pipeline reads and writes this many values at a time
+PIPELINE_BATCH = 65536
+
+# pipeline step names (symbols as shown in the expression display)
+PIPELINE_OPERATORS = {
+    "add": "add", "+": "add", "＋": "add",
+    "subtract": "subtract", "-": "subtract", "－": "subtract",
+    "multiply": "multiply", "×": "multiply", "*": "multiply",
+    "divide": "divide", "÷": "divide", "/": "divide",
+    "and": "and", "or": "or", "xor": "xor",
+    "shl": "shl", "<<": "shl", "shift left": "shl",
+    "shr": "shr", ">>": "shr", "shift right": "shr",
+}
+
+@lru_cache(maxsize=None)
+def theme_styles(theme):
+    """Palette colors and stylesheets for a theme, built once per process"""
+    if theme == "dark":
+        # ダークテーマの最適化
+        bg_color = "#0D1117"        # GitHub風の深い背景
+        text_color = "#F0F6FC"      # より鮮明な白
+        icon = "☀️"
+        
+        # 元の色設定を維持
+        digit_bg = "#2D2D2D"
+        func_bg  = "#374955"
+        eq_bg    = "#004C69"
+        clr_bg   = "#484264"
+        
+        # ディスプレイ背景の最適化
+        disp_bg = "#161B22"
+        expr_bg = "#0D1117"
+        error_color = "#F85149"
+        
+    else:
+        # ライトテーマの最適化
+        bg_color = "#FFFFFF"
+        text_color = "#1F2328"      # より読みやすい濃い色
+        icon = "🌙"
+        
+        # 元の色設定を維持
+        digit_bg = "#E0E0E0"
+        func_bg  = "#D2E5F4"
+        eq_bg    = "#C2E8FF"
+        clr_bg   = "#E5DEFF"
+        
+        # ディスプレイ背景の最適化
+        disp_bg = "#F6F8FA"
+        expr_bg = "#FFFFFF"
+        error_color = "#CF222E"
+
+    styles = {"bg": bg_color, "text": text_color, "icon": icon}
+
+    # ヘッダーボタンのスタイリング改善
+    styles["header"] = f"""
+        QPushButton {{
+            background-color: {func_bg};
+            color: {text_color};
+            border-radius: 40px;
+            border: 2px solid {"#30363D" if theme == "dark" else "#D8DEE4"};
+            font-weight: bold;
+        }}
+        QPushButton:hover {{
+            background-color: {"#30363D" if theme == "dark" else "#C7CED6"};
+            border: 2px solid {"#58A6FF" if theme == "dark" else "#0969DA"};
+            transform: scale(1.05);
+        }}
+        QPushButton:pressed {{
+            transform: scale(0.95);
+            background-color: {"#21262D" if theme == "dark" else "#B1B9C1"};
+        }}
+    """
+
+    # メインディスプレイのスタイリング改善
+    styles["display"] = f"""
+        QLabel {{
+            background: {disp_bg};
+            color: {text_color};
+            border-radius: 25px;
+            padding-right: 35px;
+            border: 3px solid {"#30363D" if theme == "dark" else "#D8DEE4"};
+            font-weight: bold;
+        }}
+    """
+
+    # 式表示のスタイリング改善
+    expr_color = "#8B949E" if theme == "dark" else "#656D76"
+    styles["expression"] = f"""
+        QLabel {{
+            background: {expr_bg};
+            color: {expr_color};
+            border-radius: 15px;
+            padding-right: 25px;
+            border: 2px solid {"#21262D" if theme == "dark" else "#E1E7ED"};
+            font-weight: 500;
+        }}
+    """
+
+    # エラー表示(ステータス行)
+    styles["status"] = f"""
+        QLabel {{
+            color: {error_color};
+            padding-right: 10px;
+            font-weight: 500;
+        }}
+    """
+
+    # 元のボタン色設定を維持したスタイリング
+    # ホバーとプレス効果を追加
+    hover_opacity = "CC" if theme == "dark" else "DD"
+    pressed_opacity = "AA" if theme == "dark" else "BB"
+    for name, bg in (("equal", eq_bg), ("clear", clr_bg), ("digit", digit_bg), ("func", func_bg)):
+        styles[name] = f"""
+            QPushButton {{
+                background-color: {bg};
+                color: {text_color};
+                border-radius: 60px;
+                border: 2px solid {"#30363D" if theme == "dark" else "#D8DEE4"};
+                font-weight: bold;
+            }}
+            QPushButton:hover {{
+                background-color: {bg}{hover_opacity};
+                border: 2px solid {"#58A6FF" if theme == "dark" else "#0969DA"};
+                transform: scale(1.02);
+            }}
+            QPushButton:pressed {{
+                background-color: {bg}{pressed_opacity};
+                transform: scale(0.98);
+                border: 2px solid {"#F0F6FC" if theme == "dark" else "#1F2328"};
+            }}
+        """
+    return styles
+
+
+@lru_cache(maxsize=None)
+def theme_palette(theme):
+    """Palette for one theme, built once and set on each session using it"""
+    styles = theme_styles(theme)
+    pal = QPalette()
+    pal.setColor(QPalette.Window,      QColor(styles["bg"]))
+    pal.setColor(QPalette.WindowText,  QColor(styles["text"]))
+    pal.setColor(QPalette.Base,        QColor(styles["bg"]))
+    pal.setColor(QPalette.Text,        QColor(styles["text"]))
+    return pal
+
+
+_app_style = None
+
+
+def apply_app_style():
+    """App-wide Fusion style, set once; palettes stay per session"""
+    global _app_style
+    if _app_style is None:
+        _app_style = QStyleFactory.create("Fusion")
+        QApplication.setStyle(_app_style)
+
+
 class BinaryCalculator(QWidget):
-    def __init__(self):
+    def __init__(self, frac_bits=DEFAULT_FRAC_BITS):
         super().__init__()
         self.setWindowTitle("Binary Calculator")
         self.setFixedSize(1280, 815)
+        # paint the session palette's window colour even as a tab page
+        self.setAutoFillBackground(True)
+        self.frac_bits = frac_bits
 
         self.reset_state()
         self.current_theme = "dark"   # dark / light
         self.current_lang  = "EN"     # EN / JP
+        self.stats = {"errors": 0}
 
         self._init_ui()
         self.apply_theme()
         self.apply_language()
 
+        self.history = deque([self.snapshot()], maxlen=HISTORY_LIMIT)
+        self.redo_stack = []
+        self._digit_run = False
+
     def reset_state(self, keep_result=False):
         if keep_result:
             self.current_value = self.last_result
-            self.expression = self.last_result
+            self.expression = (self.last_result,)
         else:
             self.current_value = ""
-            self.expression = ""
+            self.expression = ()
         self.operator = None
         self.waiting_for_operand = False
         self.last_result = ""
@@ -50,9 +306,20 @@ class BinaryCalculator(QWidget):
         header.addWidget(self.btn_theme)
         header.addWidget(self.btn_lang)
         header.addStretch()
+
+        # status line: non-modal error messages, cleared by a single timer
+        self.status_display = QLabel("")
+        self.status_display.setFont(QFont("Helvetica Neue", 22, QFont.Medium))
+        self.status_display.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        header.addWidget(self.status_display)
+        self.status_timer = QTimer(self)
+        self.status_timer.setSingleShot(True)
+        self.status_timer.timeout.connect(self.clear_status)
         vbox.addLayout(header)
 
         # expression display (shows full expression)
+        self.shown_expression = ()
+        self.show_equals = False
         self.expression_display = QLabel("")
         self.expression_display.setFont(QFont("Helvetica Neue", 26, QFont.Medium))
         self.expression_display.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
@@ -96,133 +363,36 @@ class BinaryCalculator(QWidget):
 
         vbox.addLayout(grid)
 
+        # coalesced display updates for digit keys
+        self.display_timer = QTimer(self)
+        self.display_timer.setSingleShot(True)
+        self.display_timer.setInterval(DISPLAY_FRAME_MS)
+        self.display_timer.timeout.connect(self.update_display)
+
     # theme
     def toggle_theme(self):
         self.current_theme = "light" if self.current_theme=="dark" else "dark"
         self.apply_theme()
 
     def apply_theme(self):
-        QApplication.setStyle(QStyleFactory.create("Fusion"))
-        pal = QPalette()
-
-        if self.current_theme == "dark":
-            # ダークテーマの最適化
-            bg_color = "#0D1117"        # GitHub風の深い背景
-            text_color = "#F0F6FC"      # より鮮明な白
-            self.btn_theme.setText("☀️")
-            
-            # 元の色設定を維持
-            digit_bg = "#2D2D2D"
-            func_bg  = "#374955"
-            eq_bg    = "#004C69"
-            clr_bg   = "#484264"
-            
-            # ディスプレイ背景の最適化
-            disp_bg = "#161B22"
-            expr_bg = "#0D1117"
-            
-        else:
-            # ライトテーマの最適化
-            bg_color = "#FFFFFF"
-            text_color = "#1F2328"      # より読みやすい濃い色
-            self.btn_theme.setText("🌙")
-            
-            # 元の色設定を維持
-            digit_bg = "#E0E0E0"
-            func_bg  = "#D2E5F4"
-            eq_bg    = "#C2E8FF"
-            clr_bg   = "#E5DEFF"
-            
-            # ディスプレイ背景の最適化
-            disp_bg = "#F6F8FA"
-            expr_bg = "#FFFFFF"
-
-        pal.setColor(QPalette.Window,      QColor(bg_color))
-        pal.setColor(QPalette.WindowText,  QColor(text_color))
-        pal.setColor(QPalette.Base,        QColor(bg_color))
-        pal.setColor(QPalette.Text,        QColor(text_color))
-        QApplication.setPalette(pal)
+        styles = theme_styles(self.current_theme)
+        apply_app_style()
+        self.setPalette(theme_palette(self.current_theme))
+        self.btn_theme.setText(styles["icon"])
 
-        # ヘッダーボタンのスタイリング改善
         for header_btn in (self.btn_theme, self.btn_lang):
-            header_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {func_bg};
-                    color: {text_color};
-                    border-radius: 40px;
-                    border: 2px solid {"#30363D" if self.current_theme == "dark" else "#D8DEE4"};
-                    font-weight: bold;
-                }}
-                QPushButton:hover {{
-                    background-color: {"#30363D" if self.current_theme == "dark" else "#C7CED6"};
-                    border: 2px solid {"#58A6FF" if self.current_theme == "dark" else "#0969DA"};
-                    transform: scale(1.05);
-                }}
-                QPushButton:pressed {{
-                    transform: scale(0.95);
-                    background-color: {"#21262D" if self.current_theme == "dark" else "#B1B9C1"};
-                }}
-            """)
-
-        # メインディスプレイのスタイリング改善
-        self.display.setStyleSheet(f"""
-            QLabel {{
-                background: {disp_bg};
-                color: {text_color};
-                border-radius: 25px;
-                padding-right: 35px;
-                border: 3px solid {"#30363D" if self.current_theme == "dark" else "#D8DEE4"};
-                font-weight: bold;
-            }}
-        """)
-
-        # 式表示のスタイリング改善
-        expr_color = "#8B949E" if self.current_theme == "dark" else "#656D76"
-        self.expression_display.setStyleSheet(f"""
-            QLabel {{
-                background: {expr_bg};
-                color: {expr_color};
-                border-radius: 15px;
-                padding-right: 25px;
-                border: 2px solid {"#21262D" if self.current_theme == "dark" else "#E1E7ED"};
-                font-weight: 500;
-            }}
-        """)
+            header_btn.setStyleSheet(styles["header"])
+        self.display.setStyleSheet(styles["display"])
+        self.expression_display.setStyleSheet(styles["expression"])
+        self.status_display.setStyleSheet(styles["status"])
 
-        # 元のボタン色設定を維持したスタイリング
         for key, btn in self.buttons.items():
-            if key == "equal":
-                bg = eq_bg
-            elif key == "clear":
-                bg = clr_bg
+            if key in ("equal", "clear"):
+                btn.setStyleSheet(styles[key])
             elif btn.property("type") == "digit":
-                bg = digit_bg
+                btn.setStyleSheet(styles["digit"])
             else:
-                bg = func_bg
-
-            # ホバーとプレス効果を追加
-            hover_opacity = "CC" if self.current_theme == "dark" else "DD"
-            pressed_opacity = "AA" if self.current_theme == "dark" else "BB"
-
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {bg};
-                    color: {text_color};
-                    border-radius: 60px;
-                    border: 2px solid {"#30363D" if self.current_theme == "dark" else "#D8DEE4"};
-                    font-weight: bold;
-                }}
-                QPushButton:hover {{
-                    background-color: {bg}{hover_opacity};
-                    border: 2px solid {"#58A6FF" if self.current_theme == "dark" else "#0969DA"};
-                    transform: scale(1.02);
-                }}
-                QPushButton:pressed {{
-                    background-color: {bg}{pressed_opacity};
-                    transform: scale(0.98);
-                    border: 2px solid {"#F0F6FC" if self.current_theme == "dark" else "#1F2328"};
-                }}
-            """)
+                btn.setStyleSheet(styles["func"])
 
     # language
     def toggle_language(self):
@@ -241,23 +411,36 @@ class BinaryCalculator(QWidget):
         }
         for k, btn in self.buttons.items():
             btn.setText(labels[self.current_lang][k])
+        self.show_expression(self.shown_expression, self.show_equals)
 
     # input / calc
     def on_button(self, key):
+        if key == "undo":
+            self.undo()
+        elif key == "redo":
+            self.redo()
+        else:
+            self.handle_key(key)
+            self.record_state(key)
+
+    def handle_key(self, key):
+        if key not in ("0","1"):
+            # render pending digit input before another key reads or replaces it
+            self.flush_display()
+
         if key == "clear":
             self.reset_state()
             self.display.setText("0")
-            self.expression_display.setText("")
+            self.show_expression()
             return
 
         if key == "back":
             if self.waiting_for_operand:
                 # Remove last operator from expression
-                if self.expression and self.expression.split():
-                    parts = self.expression.split()
-                    if len(parts) >= 2:
-                        self.expression = " ".join(parts[:-1])
-                        self.expression_display.setText(self.expression)
+                if self.expression:
+                    if len(self.expression) >= 2:
+                        self.expression = self.expression[:-1]
+                        self.show_expression(self.expression)
                     self.operator = None
                     self.waiting_for_operand = False
             else:
@@ -278,12 +461,9 @@ class BinaryCalculator(QWidget):
         if key in ("add","subtract","multiply","divide","and","or","xor"):
             if self.waiting_for_operand:
                 # Replace the last operator
-                if self.expression and self.expression.split():
-                    parts = self.expression.split()
-                    if len(parts) >= 2:
-                        parts[-1] = self.op_symbol(key)
-                        self.expression = " ".join(parts)
-                        self.expression_display.setText(self.expression)
+                if len(self.expression) >= 2:
+                    self.expression = self.expression[:-1] + (key,)
+                    self.show_expression(self.expression)
                 self.operator = key
                 return
             
@@ -294,19 +474,19 @@ class BinaryCalculator(QWidget):
             # Add current value to expression if not already there
             if self.current_value:
                 if self.expression:
-                    self.expression += f" {self.op_symbol(key)}"
+                    self.expression += (key,)
                 else:
-                    self.expression = f"{self.current_value} {self.op_symbol(key)}"
+                    self.expression = (self.current_value, key)
             elif self.last_result:
                 # Use last result if no current value
-                self.expression = f"{self.last_result} {self.op_symbol(key)}"
+                self.expression = (self.last_result, key)
                 self.current_value = self.last_result
             else:
                 return
             
             self.operator = key
             self.waiting_for_operand = True
-            self.expression_display.setText(self.expression)
+            self.show_expression(self.expression)
             return
 
         if key in ("0","1"):
@@ -321,7 +501,21 @@ class BinaryCalculator(QWidget):
                 else:
                     self.current_value += key
             
-            self.display.setText(self.current_value)
+            self.update_display(coalesce=True)
+
+    def update_display(self, coalesce=False):
+        """Show the operand being typed"""
+        if coalesce:
+            if not self.display_timer.isActive():
+                self.display_timer.start()
+            return
+        self.display_timer.stop()
+        self.display.setText(self.current_value or "0")
+
+    def flush_display(self):
+        """Apply a pending coalesced display update now"""
+        if self.display_timer.isActive():
+            self.update_display()
 
     def calculate_intermediate(self):
         """Calculate intermediate result for continuous operations"""
@@ -330,17 +524,16 @@ class BinaryCalculator(QWidget):
         
         try:
             # Extract the last operand from expression
-            parts = self.expression.split()
-            if len(parts) >= 1:
-                operand1 = parts[0]
-                x = int(operand1, 2)
-                y = int(self.current_value, 2)
+            if len(self.expression) >= 1:
+                operand1 = self.expression[0]
+                x = self.parse_operand(operand1, self.frac_bits)
+                y = self.parse_operand(self.current_value, self.frac_bits)
                 
-                result = self.perform_operation(x, y, self.operator)
-                result_str = self.format_result(result)
+                result = self.perform_operation(x, y, self.operator, self.frac_bits)
+                result_str = self.format_result(result, self.frac_bits)
                 
                 # Update expression with the intermediate result
-                self.expression = result_str
+                self.expression = (result_str,)
                 self.current_value = result_str
                 self.display.setText(result_str)
                 
@@ -355,19 +548,18 @@ class BinaryCalculator(QWidget):
         try:
             # If we're waiting for operand, remove the trailing operator
             if self.waiting_for_operand:
-                parts = self.expression.split()
-                if len(parts) >= 2:
-                    self.expression = parts[0]
-                    self.current_value = parts[0]
+                if len(self.expression) >= 2:
+                    self.expression = self.expression[:1]
+                    self.current_value = self.expression[0]
             elif self.operator and self.current_value:
                 # Add the current operand to complete the expression
-                self.expression += f" {self.current_value}"
+                self.expression += (self.current_value,)
             
-            # Parse and calculate the full expression
-            result_str = self.evaluate_expression(self.expression)
+            # Calculate the full expression
+            result_str = evaluate_tokens(self.expression, self.frac_bits)
             
             self.display.setText(result_str)
-            self.expression_display.setText(f"{self.expression} =")
+            self.show_expression(self.expression, equals=True)
             self.last_result = result_str
             self.reset_state(keep_result=True)
             
@@ -375,52 +567,22 @@ class BinaryCalculator(QWidget):
             self.show_error(str(e))
 
     def evaluate_expression(self, expression):
-        """Evaluate a binary expression string"""
-        parts = expression.split()
-        if len(parts) == 1:
-            return parts[0]
-        
-        # Process left to right (no operator precedence for simplicity)
-        result = int(parts[0], 2)
-        
-        i = 1
-        while i < len(parts) - 1:
-            operator = parts[i]
-            operand = int(parts[i + 1], 2)
-            
-            if operator in ("+", "＋"):
-                result = result + operand
-            elif operator in ("-", "－"):
-                result = result - operand
-            elif operator == "×":
-                result = result * operand
-            elif operator == "÷":
-                if operand == 0:
-                    raise ZeroDivisionError
-                result = result // operand
-            elif operator == "AND":
-                result = result & operand
-            elif operator == "OR":
-                result = result | operand
-            elif operator == "XOR":
-                result = result ^ operand
-            
-            i += 2
-        
-        return self.format_result(result)
+        """Evaluate a binary expression string (shared engine and result cache)"""
+        return evaluate(expression, self.frac_bits)
 
-    def perform_operation(self, x, y, operator):
-        """Perform a single operation"""
+    @staticmethod
+    def perform_operation(x, y, operator, frac_bits=0):
+        """Perform a single operation (on fixed-point values scaled by 2**frac_bits)"""
         if operator == "add":
             return x + y
         elif operator == "subtract":
             return x - y
         elif operator == "multiply":
-            return x * y
+            return (x * y) >> frac_bits
         elif operator == "divide":
             if y == 0:
                 raise ZeroDivisionError
-            return x // y
+            return (x << frac_bits) // y
         elif operator == "and":
             return x & y
         elif operator == "or":
@@ -428,24 +590,35 @@ class BinaryCalculator(QWidget):
         elif operator == "xor":
             return x ^ y
 
-    def format_result(self, result):
-        """Format integer result as binary string"""
+    @staticmethod
+    def format_result(result, frac_bits=0):
+        """Format integer result as binary string (e.g. "1.0101" with frac_bits)"""
         sign = "-" if result < 0 else ""
-        return sign + bin(abs(result))[2:]
+        digits = bin(abs(result))[2:]
+        if not frac_bits:
+            return sign + digits
+        digits = digits.rjust(frac_bits + 1, "0")
+        frac = digits[-frac_bits:].rstrip("0")
+        return sign + digits[:-frac_bits] + ("." + frac if frac else "")
+
+    @staticmethod
+    def parse_operand(s, frac_bits=0):
+        """Parse a binary string such as "-1.01" into an int scaled by 2**frac_bits"""
+        if "." not in s:
+            return int(s, 2) << frac_bits
+        if not frac_bits:
+            raise ValueError(f"fractional operand in integer mode: {s!r}")
+        whole, frac = s.split(".", 1)
+        if whole in ("", "-"):
+            whole += "0"
+        if frac and frac[0] in "+-":
+            raise ValueError(f"invalid binary literal: {s!r}")
+        return int(whole + frac[:frac_bits].ljust(frac_bits, "0"), 2)
 
     def op_symbol(self, operator=None):
         """Get display symbol for operator"""
         op = operator or self.operator
-        symbols = {
-            "add": "+" if self.current_lang == "EN" else "＋",
-            "subtract": "-" if self.current_lang == "EN" else "－",
-            "multiply": "×",
-            "divide": "÷",
-            "and": "AND",
-            "or": "OR",
-            "xor": "XOR"
-        }
-        return symbols.get(op, "")
+        return DISPLAY_SYMBOLS[self.current_lang].get(op, "")
 
     def show_error(self, error_type):
         """Show error message"""
@@ -460,29 +633,1164 @@ class BinaryCalculator(QWidget):
                 "JP": "無効な入力です。"
             }[self.current_lang]
         
-        QMessageBox.critical(self, "Error", msg, QMessageBox.Close)
+        self.show_status(msg)
         self.reset_state()
         self.display.setText("0")
-        self.expression_display.setText("")
+        self.show_expression()
+
+    def show_status(self, msg):
+        """Status line instead of a modal dialog, so key events keep flowing"""
+        self.stats["errors"] += 1
+        self.status_display.setText(msg)
+        self.status_timer.start(3000)
+
+    def show_expression(self, tokens=(), equals=False):
+        """Render expression tokens (plus " =") into the expression display"""
+        self.shown_expression = tokens
+        self.show_equals = equals
+        text = " ".join(token if i % 2 == 0 else self.op_symbol(token)
+                        for i, token in enumerate(tokens))
+        self.expression_display.setText(f"{text} =" if equals else text)
+
+    # undo / redo
+    def snapshot(self):
+        """Current state as an immutable CalcState (O(1), strings shared)"""
+        return CalcState(
+            self.current_value, self.expression, self.operator,
+            self.waiting_for_operand, self.last_result,
+            self.shown_expression, self.show_equals,
+        )
+
+    def restore(self, state):
+        """Restore a snapshot; the main display always shows current_value"""
+        (self.current_value, self.expression, self.operator,
+         self.waiting_for_operand, self.last_result, _, _) = state
+        self.display_timer.stop()
+        self.display.setText(self.current_value or "0")
+        self.show_expression(state.shown_expression, state.show_equals)
+
+    def record_state(self, key):
+        """Push the state after a key; a run of digits is kept as one step"""
+        state = self.snapshot()
+        if state == self.history[-1]:
+            return
+        if key in ("0","1") and self._digit_run:
+            self.history[-1] = state
+        else:
+            self.history.append(state)
+        self._digit_run = key in ("0","1")
+        self.redo_stack.clear()
+
+    def undo(self):
+        if len(self.history) < 2:
+            return
+        self.redo_stack.append(self.history.pop())
+        self._digit_run = False
+        self.restore(self.history[-1])
+
+    def redo(self):
+        if not self.redo_stack:
+            return
+        self.history.append(self.redo_stack.pop())
+        self._digit_run = False
+        self.restore(self.history[-1])
+
+    # export / import
+    def export_result(self, path, fmt=None, byteorder="big"):
+        """Export the displayed value as bytes; no '0'/'1' text goes to the file"""
+        value = self.parse_operand(self.current_value or "0", self.frac_bits)
+        return export_value(value, path, fmt or format_for_path(path), byteorder, self.frac_bits)
+
+    def import_operand(self, path, fmt=None, byteorder="big"):
+        """Load a value exported by export_value as the operand being entered"""
+        value, frac_bits = import_value(path, fmt, byteorder)
+        if frac_bits != self.frac_bits:
+            if frac_bits < self.frac_bits:
+                value <<= self.frac_bits - frac_bits
+            else:
+                value >>= frac_bits - self.frac_bits
+        self.flush_display()
+        if self.operator is None:
+            # replaces a shown result instead of extending it
+            self.expression = ()
+        self.current_value = self.format_result(value, self.frac_bits)
+        self.waiting_for_operand = False
+        self.update_display()
+        self.record_state("import")
+
+    def export_dialog(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export", "", EXPORT_FILTER)
+        if path:
+            try:
+                self.export_result(path)
+            except (OSError, ValueError) as e:
+                self.show_status(str(e))
+
+    def import_dialog(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Import", "", EXPORT_FILTER)
+        if path:
+            try:
+                self.import_operand(path)
+            except (OSError, ValueError) as e:
+                self.show_status(str(e))
+
+    def clear_status(self):
+        """Clear the error status line"""
+        self.status_display.setText("")
 
     def keyPressEvent(self, event):
         # Optional: keyboard shortcuts
-        keymap = {
-            Qt.Key_0: "0", Qt.Key_1: "1",
-            Qt.Key_Plus: "add", Qt.Key_Minus: "subtract",
-            Qt.Key_Asterisk: "multiply", Qt.Key_Slash: "divide",
-            Qt.Key_Equal: "equal", Qt.Key_Return: "equal", Qt.Key_Enter: "equal",
-            Qt.Key_Backspace: "back", Qt.Key_Delete: "clear",
-        }
-        if event.key() in keymap:
-            self.on_button(keymap[event.key()])
+        if event.matches(QKeySequence.Undo):
+            self.on_button("undo")
+            return
+        if event.matches(QKeySequence.Redo):
+            self.on_button("redo")
+            return
+        if event.matches(QKeySequence.Save):
+            self.export_dialog()
+            return
+        if event.matches(QKeySequence.Open):
+            self.import_dialog()
+            return
+        key = KEYMAP.get(event.key())
+        if key is not None:
+            self.on_button(key)
         else:
             super().keyPressEvent(event)
 
+
+def evaluate_tokens(tokens, frac_bits=0):
+    """Evaluate an expression token tuple (operand, op, operand, ...).
+
+    Module level so every session shares one engine and one result cache.
+    """
+    if sum(map(len, tokens)) > RESULT_CACHE_MAX_CHARS:
+        return _evaluate_tokens(tokens, frac_bits)
+    return _evaluate_tokens_cached(tokens, frac_bits)
+
+
+def _evaluate_tokens(tokens, frac_bits):
+    if len(tokens) == 1:
+        return tokens[0]
+    
+    # Process left to right (no operator precedence for simplicity)
+    result = BinaryCalculator.parse_operand(tokens[0], frac_bits)
+    
+    for i in range(1, len(tokens) - 1, 2):
+        operator = tokens[i]
+        operand = BinaryCalculator.parse_operand(tokens[i + 1], frac_bits)
+        if operator in CALC_OPERATORS:
+            result = BinaryCalculator.perform_operation(result, operand, operator, frac_bits)
+    
+    return BinaryCalculator.format_result(result, frac_bits)
+
+
+_evaluate_tokens_cached = lru_cache(maxsize=RESULT_CACHE_SIZE)(_evaluate_tokens)
+
+
+def evaluate(expression, frac_bits=0):
+    """Evaluate a binary expression string as shown in the display"""
+    tokens = tuple(EXPRESSION_OPERATORS.get(part, part) for part in expression.split())
+    return evaluate_tokens(tokens, frac_bits)
+
+
+class SessionTabs(QTabWidget):
+    """Independent calculator sessions in one window.
+
+    Sessions keep their own state and theme but share evaluate() (engine and
+    result cache) and the theme stylesheets and palettes, so opening one
+    only builds its widgets.
+    """
+    def __init__(self, sessions=1, frac_bits=DEFAULT_FRAC_BITS):
+        super().__init__()
+        self.setWindowTitle("Binary Calculator")
+        self.frac_bits = frac_bits
+        self._opened = 0
+        self.setTabsClosable(True)
+        self.setTabBarAutoHide(True)
+        self.tabCloseRequested.connect(self.close_session)
+        self.currentChanged.connect(self.sync_theme)
+        QShortcut(QKeySequence.AddTab, self, self.new_session)
+        for _ in range(sessions):
+            self.new_session()
+
+    def new_session(self):
+        calc = BinaryCalculator(self.frac_bits)
+        calc.btn_theme.clicked.connect(self.sync_theme)
+        self._opened += 1
+        self.addTab(calc, f"#{self._opened}")
+        self.setCurrentWidget(calc)
+        calc.setFocus()
+        return calc
+
+    def close_session(self, index):
+        if self.count() > 1:
+            calc = self.widget(index)
+            self.removeTab(index)
+            calc.deleteLater()
+
+    def sync_theme(self):
+        """Tab bar and pane follow the theme of the session being shown"""
+        calc = self.currentWidget()
+        if calc is not None:
+            self.setPalette(theme_palette(calc.current_theme))
+
+
+# optional native kernels: bitops.c built next to this script, loaded with ctypes
+def _load_native():
+    """Load the bitops shared library, or return None"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in ("bitops.so", "bitops.dylib", "bitops.dll"):
+        path = os.path.join(here, name)
+        if not os.path.exists(path):
+            continue
+        try:
+            lib = ctypes.CDLL(path)
+        except OSError:
+            continue
+        try:
+            for op in FILE_OPERATORS:
+                fn = getattr(lib, f"bitops_{op}")
+                fn.argtypes = (ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t)
+                fn.restype = None
+            lib.bitops_popcount.argtypes = (ctypes.c_void_p, ctypes.c_size_t)
+            lib.bitops_popcount.restype = ctypes.c_uint64
+        except AttributeError:
+            continue  # stale or foreign build without every kernel
+        return lib
+    return None
+
+
+native = _load_native()
+
+# fastest available first; BINCALC_BACKEND=native/numpy/python overrides
+AVAILABLE_BACKENDS = tuple(
+    name for name, ok in (("native", native is not None), ("numpy", np is not None), ("python", True))
+    if ok
+)
+BITWISE_BACKEND = os.environ.get("BINCALC_BACKEND", AVAILABLE_BACKENDS[0])
+if BITWISE_BACKEND not in AVAILABLE_BACKENDS:
+    BITWISE_BACKEND = AVAILABLE_BACKENDS[0]
+
+
+def _address(buf):
+    """Address of a writable buffer, for passing to the native kernels"""
+    return ctypes.addressof(ctypes.c_char.from_buffer(buf))
+
+
+def _map_file(f, size, access):
+    """mmap a file, or return empty bytes for a zero-length file"""
+    if size == 0:
+        return b""
+    return mmap.mmap(f.fileno(), size, access=access)
+
+
+def _bitwise_chunk(a, b, out, operator, backend):
+    """Apply a bitwise operator to two equal-length buffers, writing into out"""
+    if backend == "native":
+        getattr(native, f"bitops_{operator}")(_address(a), _address(b), _address(out), len(a))
+        return
+    if backend == "numpy":
+        x = np.frombuffer(a, dtype=np.uint8)
+        y = np.frombuffer(b, dtype=np.uint8)
+        o = np.frombuffer(out, dtype=np.uint8)
+        {"and": np.bitwise_and, "or": np.bitwise_or, "xor": np.bitwise_xor}[operator](x, y, out=o)
+        return
+    n = len(a)
+    r = BinaryCalculator.perform_operation(
+        int.from_bytes(a, "big"), int.from_bytes(b, "big"), operator)
+    out[:] = r.to_bytes(n, "big")
+
+
+def _popcount_chunk(buf, backend):
+    """Number of set bits in a buffer"""
+    if backend == "native":
+        return native.bitops_popcount(_address(buf), len(buf))
+    if backend == "numpy":
+        x = np.frombuffer(buf, dtype=np.uint8)
+        if hasattr(np, "bitwise_count"):
+            return int(np.bitwise_count(x).sum(dtype=np.uint64))
+        return int(np.unpackbits(x).sum(dtype=np.uint64))
+    return int.from_bytes(buf, "big").bit_count()
+
+
+def bitwise_files(path1, path2, out_path, operator, chunk_size=FILE_CHUNK_SIZE, backend=None):
+    """Stream a bitwise operation over two raw binary files into out_path.
+
+    Each file is read as one big-endian unsigned integer, so a shorter operand
+    is zero-extended on the left, exactly like int(s, 2) on the display.
+    The result goes to a temporary file that replaces out_path at the end, so
+    out_path may also be one of the inputs (in-place a ^= b).
+    Returns (bytes_written, seconds).
+    """
+    if operator not in FILE_OPERATORS:
+        raise ValueError(f"unsupported file operator: {operator}")
+    backend = backend or BITWISE_BACKEND
+
+    size1 = os.path.getsize(path1)
+    size2 = os.path.getsize(path2)
+    size = max(size1, size2)
+    start = time.perf_counter()
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(out_path)),
+                                    prefix=".bincalc-", suffix=".tmp")
+    try:
+        try:
+            fo = os.fdopen(fd, "w+b")
+        except BaseException:
+            os.close(fd)
+            raise
+        with fo, open(path1, "rb") as f1, open(path2, "rb") as f2:
+            _bitwise_files(f1, f2, fo, size1, size2, operator, chunk_size, backend)
+        # mkstemp makes the file 0600; keep the mode out_path has (or would get)
+        os.chmod(tmp_path, _output_mode(out_path))
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    return size, time.perf_counter() - start
+
+
+def _output_mode(path):
+    """Permission bits of an existing file, else what open() would create"""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def _bitwise_files(f1, f2, fo, size1, size2, operator, chunk_size, backend):
+    """Body of bitwise_files on already opened files"""
+    size = max(size1, size2)
+    fo.truncate(size)
+    # ACCESS_COPY: private writable mappings (never written), so ctypes can
+    # take their address without copying
+    m1 = _map_file(f1, size1, mmap.ACCESS_COPY)
+    m2 = _map_file(f2, size2, mmap.ACCESS_COPY)
+    mo = _map_file(fo, size, mmap.ACCESS_WRITE)
+    v1, v2, vo = memoryview(m1), memoryview(m2), memoryview(mo)
+    try:
+        # leading bytes that only the longer operand has (the other is 0)
+        longer = v1 if size1 >= size2 else v2
+        head = size - min(size1, size2)
+        zeros = memoryview(bytearray(min(chunk_size, head)))
+        for pos in range(0, head, chunk_size):
+            end = min(pos + chunk_size, head)
+            _bitwise_chunk(longer[pos:end], zeros[:end - pos], vo[pos:end], operator, backend)
+
+        # overlapping part, aligned on the least significant byte
+        off1, off2 = size - size1, size - size2
+        for pos in range(head, size, chunk_size):
+            end = min(pos + chunk_size, size)
+            _bitwise_chunk(v1[pos - off1:end - off1], v2[pos - off2:end - off2],
+                           vo[pos:end], operator, backend)
+    finally:
+        v1.release()
+        v2.release()
+        vo.release()
+        for m in (m1, m2, mo):
+            if isinstance(m, mmap.mmap):
+                m.close()
+
+
+def popcount_file(path, chunk_size=FILE_CHUNK_SIZE, backend=None):
+    """Count the set bits of a raw binary file. Returns (count, bytes_read, seconds)"""
+    backend = backend or BITWISE_BACKEND
+    size = os.path.getsize(path)
+    start = time.perf_counter()
+    count = 0
+    with open(path, "rb") as f:
+        m = _map_file(f, size, mmap.ACCESS_COPY)
+        view = memoryview(m)
+        try:
+            for pos in range(0, size, chunk_size):
+                count += _popcount_chunk(view[pos:pos + chunk_size], backend)
+        finally:
+            view.release()
+            if isinstance(m, mmap.mmap):
+                m.close()
+    return count, size, time.perf_counter() - start
+
+
+def format_for_path(path):
+    """Export format implied by a file name: .bin raw, .hex hex, else packed"""
+    ext = os.path.splitext(path)[1].lower()
+    return EXPORT_EXTENSIONS.get(ext, "packed")
+
+
+def export_value(value, path, fmt="packed", byteorder="big", frac_bits=0):
+    """Write an int straight from int.to_bytes, in chunks. Returns the payload size.
+
+    raw: unsigned bytes only. packed: header (sign, byte order, frac_bits,
+    length) then the bytes. hex: optional "-" then big-endian hex digits.
+    raw and hex hold integers: value is unscaled from frac_bits on the way out.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"unknown export format: {fmt}")
+    if byteorder not in EXPORT_BYTEORDERS:
+        raise ValueError(f"unknown byte order: {byteorder}")
+    if fmt == "raw" and value < 0:
+        raise ValueError("raw export needs a non-negative value; use packed")
+    if fmt == "hex":
+        byteorder = "big"
+    magnitude = abs(value)
+    if fmt != "packed":
+        if magnitude & ((1 << frac_bits) - 1):
+            raise ValueError(f"{fmt} export holds integers only; use packed for fractional values")
+        magnitude >>= frac_bits
+    data = memoryview(magnitude.to_bytes((magnitude.bit_length() + 7) // 8, byteorder))
+
+    with open(path, "wb") as f:
+        if fmt == "packed":
+            flags = (1 if value < 0 else 0) | (2 if byteorder == "little" else 0)
+            f.write(EXPORT_HEADER.pack(EXPORT_MAGIC, EXPORT_VERSION, flags, frac_bits, len(data)))
+        elif fmt == "hex" and value < 0:
+            f.write(b"-")
+        for pos in range(0, len(data), EXPORT_CHUNK_SIZE):
+            chunk = data[pos:pos + EXPORT_CHUNK_SIZE]
+            f.write(binascii.hexlify(chunk) if fmt == "hex" else chunk)
+        if fmt == "hex":
+            f.write(b"\n")
+    return len(data)
+
+
+def import_value(path, fmt=None, byteorder="big"):
+    """Read a value written by export_value in O(n). Returns (value, frac_bits).
+
+    Raw and hex files hold integers, so their frac_bits is 0.
+    """
+    if byteorder not in EXPORT_BYTEORDERS:
+        raise ValueError(f"unknown byte order: {byteorder}")
+    with open(path, "rb") as f:
+        if fmt is None:
+            if os.path.splitext(path)[1].lower() in EXPORT_EXTENSIONS:
+                fmt = format_for_path(path)
+            else:
+                # the name doesn't say: packed if it has the header, else raw bytes
+                fmt = "packed" if f.read(len(EXPORT_MAGIC)) == EXPORT_MAGIC else "raw"
+                f.seek(0)
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"unknown export format: {fmt}")
+
+        if fmt == "packed":
+            header = f.read(EXPORT_HEADER.size)
+            if len(header) != EXPORT_HEADER.size:
+                raise ValueError("truncated header")
+            magic, version, flags, frac_bits, length = EXPORT_HEADER.unpack(header)
+            if magic != EXPORT_MAGIC or version != EXPORT_VERSION:
+                raise ValueError("not a packed binary calculator file")
+            data = f.read(length)
+            if len(data) != length:
+                raise ValueError("truncated payload")
+            value = int.from_bytes(data, "little" if flags & 2 else "big")
+            return (-value if flags & 1 else value), frac_bits
+
+        data = f.read()
+    if fmt == "raw":
+        return int.from_bytes(data, byteorder), 0
+    # base 16 parsing is linear in CPython
+    text = data.strip()
+    return (int(text, 16) if text else 0), 0
+
+
+def run_export(args, frac_bits):
+    """--export "<expression>" <out> [raw|packed|hex] [big|little]"""
+    if not 2 <= len(args) <= 4:
+        print('usage: --export "<expression>" <out> [raw|packed|hex] [big|little]', file=sys.stderr)
+        return 2
+    expression, path = args[:2]
+    fmt = args[2] if len(args) > 2 else format_for_path(path)
+    byteorder = args[3] if len(args) > 3 else "big"
+    try:
+        value = BinaryCalculator.parse_operand(evaluate(expression, frac_bits), frac_bits)
+        size = export_value(value, path, fmt, byteorder, frac_bits)
+    except ZeroDivisionError:
+        print("--export: division by zero", file=sys.stderr)
+        return 2
+    except (OSError, ValueError) as e:
+        print(f"--export: {e}", file=sys.stderr)
+        return 2
+    if fmt == "hex":
+        byteorder = "big"  # hex digits are always written big-endian
+    bits = (abs(value) >> (0 if fmt == "packed" else frac_bits)).bit_length()
+    print(f"{bits} bits -> {size} bytes ({fmt}, {byteorder})", file=sys.stderr)
+    return 0
+
+
+def run_import(args):
+    """--import <file> [raw|packed|hex] [big|little]: print the value as the display would"""
+    if not 1 <= len(args) <= 3:
+        print("usage: --import <file> [raw|packed|hex] [big|little]", file=sys.stderr)
+        return 2
+    fmt = args[1] if len(args) > 1 else None
+    byteorder = args[2] if len(args) > 2 else "big"
+    try:
+        value, frac_bits = import_value(args[0], fmt, byteorder)
+    except (OSError, ValueError) as e:
+        print(f"--import: {e}", file=sys.stderr)
+        return 2
+    print(BinaryCalculator.format_result(value, frac_bits))
+    return 0
+
+
+def run_file_mode(args):
+    """--files <and|or|xor> <in1> <in2> <out>"""
+    if len(args) != 4 or args[0] not in FILE_OPERATORS:
+        print("usage: --files <and|or|xor> <in1> <in2> <out>", file=sys.stderr)
+        return 2
+    operator, path1, path2, out_path = args
+    size, elapsed = bitwise_files(path1, path2, out_path, operator)
+    gbps = size / elapsed / 1e9 if elapsed > 0 else float("inf")
+    print(f"{operator.upper()}: {size} bytes in {elapsed:.3f}s ({gbps:.2f} GB/s, {BITWISE_BACKEND})")
+    return 0
+
+
+def run_popcount(args):
+    """--popcount <file>"""
+    if len(args) != 1:
+        print("usage: --popcount <file>", file=sys.stderr)
+        return 2
+    count, size, elapsed = popcount_file(args[0])
+    gbps = size / elapsed / 1e9 if elapsed > 0 else float("inf")
+    print(f"{count} bits set in {size} bytes ({elapsed:.3f}s, {gbps:.2f} GB/s, {BITWISE_BACKEND})")
+    return 0
+
+
+def run_backend_bench(args):
+    """--bench-backends [MiB]: per-GB throughput of each available backend"""
+    size = int(args[0]) * 1024 * 1024 if args else 256 * 1024 * 1024
+    print(f"active backend: {BITWISE_BACKEND} (available: {', '.join(AVAILABLE_BACKENDS)})")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = [os.path.join(tmpdir, name) for name in ("a.bin", "b.bin", "out.bin")]
+        for path in paths[:2]:
+            with open(path, "wb") as f:
+                for _ in range(0, size, FILE_CHUNK_SIZE):
+                    f.write(os.urandom(min(FILE_CHUNK_SIZE, size - f.tell())))
+        for backend in AVAILABLE_BACKENDS:
+            results = []
+            for operator in FILE_OPERATORS:
+                written, elapsed = bitwise_files(*paths, operator, backend=backend)
+                results.append(f"{operator.upper()} {written / elapsed / 1e9:.2f}")
+            _, read, elapsed = popcount_file(paths[0], backend=backend)
+            results.append(f"POPCOUNT {read / elapsed / 1e9:.2f}")
+            print(f"{backend:>7}: " + ", ".join(results) + " GB/s")
+    return 0
+
+
+def parse_pipeline(text):
+    """Parse "XOR 1010, AND 1111, shift left 2" into (operator, value) steps.
+
+    Operands are binary like the display; shift counts are decimal bit counts.
+    """
+    steps = []
+    for part in text.split(","):
+        words = part.split()
+        if len(words) < 2:
+            raise ValueError(f"invalid pipeline step: {part.strip()!r}")
+        name = " ".join(words[:-1]).lower()
+        if name not in PIPELINE_OPERATORS:
+            raise ValueError(f"unknown pipeline operator: {name!r}")
+        op = PIPELINE_OPERATORS[name]
+        if op in ("shl", "shr"):
+            value = int(words[-1], 10)
+            if value < 0:
+                raise ValueError("negative shift count")
+        else:
+            value = int(words[-1], 2)
+        steps.append((op, value))
+    return steps
+
+
+def fold_pipeline(steps):
+    """Fold adjacent constant steps into as few steps as possible.
+
+    Any run of AND/OR/XOR becomes one ("bitwise", (mask, flip)) step computing
+    (x & mask) ^ flip. Adds/subtracts, multiplies, positive divisors and shifts
+    in the same direction are merged too.
+    """
+    folded = []
+    for op, k in steps:
+        if op == "divide" and k == 0:
+            raise ZeroDivisionError
+        prev_op, prev_k = folded[-1] if folded else (None, None)
+
+        if op in FILE_OPERATORS:
+            mask, flip = prev_k if prev_op == "bitwise" else (-1, 0)
+            if op == "and":
+                mask, flip = mask & k, flip & k
+            elif op == "or":
+                mask, flip = mask & ~k, flip | k
+            else:
+                flip ^= k
+            step = ("bitwise", (mask, flip))
+        elif op in ("add", "subtract"):
+            k = k if op == "add" else -k
+            step = ("add", prev_k + k if prev_op == "add" else k)
+        elif op == "multiply":
+            step = ("multiply", prev_k * k if prev_op == "multiply" else k)
+        elif op == "divide" and prev_op == "divide" and prev_k > 0 and k > 0:
+            # (x // a) // b == x // (a * b) for positive a, b
+            step = ("divide", prev_k * k)
+        elif op in ("shl", "shr") and prev_op == op:
+            step = (op, prev_k + k)
+        else:
+            folded.append((op, k))
+            continue
+
+        if prev_op == step[0]:
+            folded[-1] = step
+        else:
+            folded.append(step)
+    return folded
+
+
+# folded pipeline steps as (function, symbol) for compile_pipeline
+PIPELINE_STEP_FUNCS = {
+    "and": (operator.and_, "&"), "xor": (operator.xor, "^"),
+    "add": (operator.add, "+"), "multiply": (operator.mul, "*"),
+    "divide": (operator.floordiv, "//"),
+    "shl": (operator.lshift, "<<"), "shr": (operator.rshift, ">>"),
+}
+
+
+def _compose_step(inner, func, k):
+    """func(inner(x), k) as one closure; inner None means x itself"""
+    if inner is None:
+        return lambda x: func(x, k)
+    return lambda x: func(inner(x), k)
+
+
+def compile_pipeline(steps):
+    """Compile pipeline steps into one fused function of x (Python ints)"""
+    fn = None
+    expr = "x"
+    for op, k in fold_pipeline(steps):
+        if op == "bitwise":
+            mask, flip = k
+            parts = ([("and", mask)] if mask != -1 else []) + ([("xor", flip)] if flip else [])
+        else:
+            parts = [(op, k)]
+        for name, k in parts:
+            func, sym = PIPELINE_STEP_FUNCS[name]
+            fn = _compose_step(fn, func, k)
+            expr = f"({expr} {sym} {k})"
+    if fn is None:
+        fn = lambda x: x
+    fn.source = expr
+    return fn
+
+
+def run_pipeline(args):
+    """--pipeline "<steps>" [infile]: apply a pipeline to binary values, one per line"""
+    if len(args) not in (1, 2):
+        print('usage: --pipeline "XOR 1010, AND 1111, shl 10" [infile]', file=sys.stderr)
+        return 2
+    try:
+        fn = compile_pipeline(parse_pipeline(args[0]))
+        src = open(args[1], encoding="utf-8") if len(args) == 2 else sys.stdin
+    except ZeroDivisionError:
+        print("--pipeline: division by zero", file=sys.stderr)
+        return 2
+    except (OSError, ValueError) as e:
+        print(f"--pipeline: {e}", file=sys.stderr)
+        return 2
+    fmt = BinaryCalculator.format_result
+
+    # stream the input in batches so memory stays flat for any number of values
+    count = 0
+    lineno = 0
+    start = time.perf_counter()
+    with src:
+        while True:
+            lines = list(islice(src, PIPELINE_BATCH))
+            if not lines:
+                break
+            try:
+                batch = [int(line, 2) for line in lines if line.strip()]
+            except ValueError:
+                lineno += _first_bad_line(lines)
+                print(f"--pipeline: line {lineno}: not a binary value", file=sys.stderr)
+                return 2
+            sys.stdout.write("".join(fmt(r) + "\n" for r in map(fn, batch)))
+            count += len(batch)
+            lineno += len(lines)
+    elapsed = time.perf_counter() - start
+
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    print(f"{count} values in {elapsed:.3f}s ({rate:.0f} values/s): {fn.source}",
+          file=sys.stderr)
+    return 0
+
+
+def _first_bad_line(lines):
+    """1-based index of the first non-blank line that is not a binary value"""
+    for n, line in enumerate(lines, 1):
+        if line.strip():
+            try:
+                int(line, 2)
+            except ValueError:
+                return n
+    return len(lines)
+
+
+def parse_keys(text):
+    """Turn a replay script into a list of on_button keys"""
+    keys = []
+    for token in text.split():
+        if token in KEY_NAMES:
+            keys.append(token)
+            continue
+        for ch in token:
+            if ch not in REPLAY_CHARS:
+                raise ValueError(f"unknown key in replay script: {ch!r}")
+            keys.append(REPLAY_CHARS[ch])
+    return keys
+
+
+def run_replay(args):
+    """--replay <keyfile>: feed a key sequence through on_button headlessly"""
+    if len(args) != 1:
+        print("usage: --replay <keyfile>", file=sys.stderr)
+        return 2
+    with open(args[0], encoding="utf-8") as f:
+        keys = parse_keys(f.read())
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication(sys.argv[:1])
+    win = BinaryCalculator()
+
+    start = time.perf_counter()
+    for key in keys:
+        win.on_button(key)
+    win.flush_display()
+    elapsed = time.perf_counter() - start
+
+    rate = len(keys) / elapsed if elapsed > 0 else float("inf")
+    print(f"{len(keys)} keys in {elapsed:.3f}s ({rate:.0f} keys/s), "
+          f"errors: {win.stats['errors']}")
+    print(win.display.text())
+    return 0
+
+
+# reference semantics for --verify (kept deliberately naive)
+REFERENCE_OPS = {
+    "add": lambda x, y: x + y,
+    "subtract": lambda x, y: x - y,
+    "multiply": lambda x, y: x * y,
+    "divide": lambda x, y: x // y,
+    "and": lambda x, y: x & y,
+    "or": lambda x, y: x | y,
+    "xor": lambda x, y: x ^ y,
+    "shl": lambda x, y: x << y,
+    "shr": lambda x, y: x >> y,
+}
+
+
+def reference_format(value, frac_bits=0):
+    magnitude = abs(value)
+    text = format(magnitude >> frac_bits, "b")
+    if frac_bits:
+        frac = format(magnitude & ((1 << frac_bits) - 1), "b").zfill(frac_bits).rstrip("0")
+        if frac:
+            text += "." + frac
+    return ("-" if value < 0 else "") + text
+
+
+def reference_op(op, x, y, frac_bits=0):
+    """One step on values scaled by 2**frac_bits, via exact fractions"""
+    if op == "multiply":
+        return Fraction(x * y, 2 ** frac_bits).__floor__()
+    if op == "divide":
+        return (Fraction(x, y) * 2 ** frac_bits).__floor__()
+    return REFERENCE_OPS[op](x, y)
+
+
+def _random_frac_bits(rnd):
+    """Integer mode half of the time, else a random number of fraction bits"""
+    return 0 if rnd.random() < 0.5 else rnd.randint(1, 64)
+
+
+def _random_terms(rnd, max_bits, max_terms=6, nonzero_divisor=False):
+    """First operand plus a list of (operator, operand), operands of random size"""
+    first = rnd.getrandbits(rnd.randint(1, max_bits))
+    terms = []
+    for _ in range(rnd.randint(0, max_terms)):
+        op = rnd.choice(CALC_OPERATORS)
+        value = rnd.getrandbits(rnd.randint(1, max_bits))
+        if op == "divide" and nonzero_divisor and value == 0:
+            value = 1
+        terms.append((op, value))
+    return first, terms
+
+
+def check_expression(rnd, win, max_bits):
+    """evaluate_expression: left to right, floor division, "-" sign, fixed point"""
+    win.frac_bits = frac_bits = _random_frac_bits(rnd)
+    first, terms = _random_terms(rnd, max_bits)
+    symbols = DISPLAY_SYMBOLS[rnd.choice(("EN", "JP"))]
+    text = " ".join([reference_format(first, frac_bits)] +
+                    [f"{symbols[op]} {reference_format(value, frac_bits)}" for op, value in terms])
+    try:
+        expected = first
+        for op, value in terms:
+            expected = reference_op(op, expected, value, frac_bits)
+    except ZeroDivisionError:
+        try:
+            win.evaluate_expression(text)
+        except ZeroDivisionError:
+            return
+        raise AssertionError(f"{text!r}: expected ZeroDivisionError")
+    got = win.evaluate_expression(text)
+    want = reference_format(expected, frac_bits)
+    assert got == want, f"{text!r} at {frac_bits} bits: {got} != {want}"
+
+
+def check_keys(rnd, win, max_bits):
+    """on_button path: intermediate collapsing, coalesced display, fixed point"""
+    win.frac_bits = frac_bits = _random_frac_bits(rnd)
+    first, terms = _random_terms(rnd, max_bits, nonzero_divisor=True)
+    keys = ["clear"] + list(format(first, "b"))
+    expected = first << frac_bits
+    for op, value in terms:
+        keys += [op] + list(format(value, "b"))
+        expected = reference_op(op, expected, value << frac_bits, frac_bits)
+    keys.append("equal")
+    for key in keys:
+        win.on_button(key)
+    win.flush_display()
+    got = win.display.text()
+    want = reference_format(expected, frac_bits)
+    assert got == want, f"{keys} at {frac_bits} bits: {got} != {want}"
+
+
+def check_history(rnd, win, max_bits):
+    """undo history shares operand strings instead of copying them per step"""
+    win.frac_bits = 0
+    operand = "1" + "".join(rnd.choice("01") for _ in range(rnd.randint(255, max(max_bits, 256))))
+    for key in ["clear"] + list(operand):
+        win.on_button(key)
+    # start from this operand, so undo cannot reach strings of earlier cases
+    win.history.clear()
+    win.history.append(win.snapshot())
+    win.redo_stack.clear()
+    keys = [rnd.choice(CALC_OPERATORS + ("back", "undo", "redo")) for _ in range(rnd.randint(1, 100))]
+    for key in keys:
+        win.on_button(key)
+    large = []
+    for state in list(win.history) + win.redo_stack:
+        strings = (state.current_value, state.last_result) + state.expression + state.shown_expression
+        large += [s for s in strings if len(s) >= 256]
+    copies = len({id(s) for s in large}) - len(set(large))
+    assert copies == 0, f"{keys}: {copies} duplicate operand strings in history"
+
+
+def check_cache(rnd, win, max_bits):
+    """evaluate() result cache: a repeated expression still matches the reference"""
+    win.frac_bits = frac_bits = _random_frac_bits(rnd)
+    first, terms = _random_terms(rnd, max_bits, nonzero_divisor=True)
+    text = " ".join([reference_format(first, frac_bits)] +
+                    [f"{DISPLAY_SYMBOLS['EN'][op]} {reference_format(value, frac_bits)}" for op, value in terms])
+    expected = first
+    for op, value in terms:
+        expected = reference_op(op, expected, value, frac_bits)
+    want = reference_format(expected, frac_bits)
+    tokens = tuple(EXPRESSION_OPERATORS.get(part, part) for part in text.split())
+    cached = sum(map(len, tokens)) <= RESULT_CACHE_MAX_CHARS
+    win.evaluate_expression(text)
+    hits = _evaluate_tokens_cached.cache_info().hits
+    got = win.evaluate_expression(text)
+    assert got == want, f"{text!r} at {frac_bits} bits (repeat): {got} != {want}"
+    assert _evaluate_tokens_cached.cache_info().hits == hits + cached, f"{text!r}: cache hit expected {cached}"
+
+
+def check_pipeline(rnd, max_bits):
+    """compile_pipeline (folded, fused) against step-by-step evaluation"""
+    steps = []
+    for _ in range(rnd.randint(1, 8)):
+        op = rnd.choice(CALC_OPERATORS + ("shl", "shr"))
+        if op in ("shl", "shr"):
+            value = rnd.randint(0, 64)
+        else:
+            value = rnd.getrandbits(rnd.randint(1, max_bits)) * rnd.choice((1, -1))
+            if op == "divide" and value == 0:
+                value = 1
+        steps.append((op, value))
+    fn = compile_pipeline(steps)
+    for _ in range(4):
+        x = rnd.getrandbits(rnd.randint(1, max_bits)) * rnd.choice((1, -1))
+        expected = x
+        for op, value in steps:
+            expected = REFERENCE_OPS[op](expected, value)
+        assert fn(x) == expected, f"{steps} x={x}: {fn.source}"
+
+
+def check_files(rnd, tmpdir):
+    """bitwise_files and popcount_file (every backend) against int operators"""
+    a = rnd.randbytes(rnd.randint(0, 96))
+    b = rnd.randbytes(rnd.randint(0, 96))
+    op = rnd.choice(FILE_OPERATORS)
+    paths = [os.path.join(tmpdir, name) for name in ("a.bin", "b.bin", "out.bin")]
+    expected = REFERENCE_OPS[op](int.from_bytes(a, "big"), int.from_bytes(b, "big"))
+    for backend in AVAILABLE_BACKENDS:
+        for path, data in zip(paths, (a, b)):
+            with open(path, "wb") as f:
+                f.write(data)
+        chunk_size = rnd.randint(1, 32)
+        # the output may also be an input (in-place a ^= b)
+        out_path = rnd.choice(paths)
+        bitwise_files(*paths[:2], out_path, op, chunk_size=chunk_size, backend=backend)
+        with open(out_path, "rb") as f:
+            out = f.read()
+        assert len(out) == max(len(a), len(b)), f"{op} ({backend}): output length {len(out)}"
+        assert int.from_bytes(out, "big") == expected, f"{op} ({backend}): {a.hex()} {b.hex()}"
+        count, _, _ = popcount_file(out_path, chunk_size=chunk_size, backend=backend)
+        assert count == expected.bit_count(), f"popcount ({backend}): {out.hex()}"
+
+
+def check_fixed_point(rnd, max_bits):
+    """fixed-point division: floor at frac_bits, format/parse round trip"""
+    frac_bits = rnd.randint(0, 2 * max_bits)
+    x = rnd.getrandbits(rnd.randint(1, max_bits)) * rnd.choice((1, -1))
+    y = rnd.getrandbits(rnd.randint(1, max_bits)) or 1
+    got = BinaryCalculator.perform_operation(x << frac_bits, y << frac_bits, "divide", frac_bits)
+    assert got == (Fraction(x, y) * 2 ** frac_bits).__floor__(), f"{x}/{y} at {frac_bits} bits"
+    text = BinaryCalculator.format_result(got, frac_bits)
+    assert BinaryCalculator.parse_operand(text, frac_bits) == got, f"round trip {text!r}"
+
+
+def check_export(rnd, tmpdir, max_bits):
+    """export_value/import_value round trip in every format and byte order"""
+    frac_bits = rnd.randint(0, max_bits)
+    value = rnd.getrandbits(rnd.randint(0, 8 * max_bits))
+    fmt = rnd.choice(EXPORT_FORMATS)
+    byteorder = rnd.choice(("big", "little"))
+    ext = {"packed": ".bcal", "raw": ".bin", "hex": ".hex"}[fmt]
+    if fmt != "raw":
+        value *= rnd.choice((1, -1))
+    elif rnd.random() < 0.5:
+        # raw bytes that happen to start with the packed magic: the .bin name decides
+        value = int.from_bytes(EXPORT_MAGIC + rnd.randbytes(rnd.randint(0, max_bits)), byteorder)
+    elif rnd.random() < 0.5:
+        ext = ".out"  # no format in the name: sniffed as raw
+    if fmt == "packed" and rnd.random() < 0.5:
+        ext = ".out"  # sniffed as packed by its header
+    path = os.path.join(tmpdir, "value" + ext)
+    if fmt != "packed" and frac_bits:
+        # raw and hex hold integers: a fractional value is refused, a whole one unscaled
+        try:
+            export_value((value << frac_bits) | 1, path, fmt, byteorder, frac_bits)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{fmt}: fractional value exported")
+    scaled = value if fmt == "packed" else value << frac_bits
+    export_value(scaled, path, fmt, byteorder, frac_bits)
+    got, stored_bits = import_value(path, rnd.choice((None, fmt)), byteorder)
+    assert got == value, f"{fmt} ({byteorder}): {got} != {value}"
+    assert stored_bits == (frac_bits if fmt == "packed" else 0), f"{fmt}: frac_bits {stored_bits}"
+
+
+def _run_cases(check, cases, seed):
+    """Run a check with Hypothesis when installed, else with a seeded Random.
+
+    Returns the engine used. Hypothesis is imported here, not at startup,
+    since only --verify needs it.
+    """
+    try:
+        from hypothesis import given, settings, strategies as st
+        from hypothesis import seed as hypothesis_seed
+    except ImportError:
+        rnd = random.Random(seed)
+        for _ in range(cases):
+            check(rnd)
+        return "random"
+    run = settings(max_examples=cases, deadline=None, database=None)(
+        given(st.randoms(use_true_random=False))(check))
+    if seed is not None:
+        run = hypothesis_seed(seed)(run)
+    run()
+    return "hypothesis"
+
+
+def measure_throughput(win, tmpdir):
+    """Throughput of each fast path, in operations (or bytes) per second"""
+    rnd = random.Random(0)
+    rates = {}
+
+    exprs = []
+    for _ in range(2000):
+        first, terms = _random_terms(rnd, 256, nonzero_divisor=True)
+        exprs.append(" ".join([format(first, "b")] +
+                              [f"{DISPLAY_SYMBOLS['EN'][op]} {v:b}" for op, v in terms]))
+    start = time.perf_counter()
+    for text in exprs:
+        win.evaluate_expression(text)
+    rates["expression"] = len(exprs) / (time.perf_counter() - start)
+
+    keys = parse_keys(" ".join("1011 xor 110 + 11 and 1111 =".split() * 2000))
+    start = time.perf_counter()
+    for key in keys:
+        win.on_button(key)
+    win.flush_display()
+    rates["keys"] = len(keys) / (time.perf_counter() - start)
+
+    fn = compile_pipeline(parse_pipeline("XOR 1010, AND 1111, OR 1, shl 2, + 1"))
+    values = [rnd.getrandbits(64) for _ in range(200000)]
+    start = time.perf_counter()
+    list(map(fn, values))
+    rates["pipeline"] = len(values) / (time.perf_counter() - start)
+
+    size = 8 * 1024 * 1024
+    paths = [os.path.join(tmpdir, name) for name in ("ta.bin", "tb.bin", "tout.bin")]
+    for path in paths[:2]:
+        with open(path, "wb") as f:
+            f.write(rnd.randbytes(size))
+    written, elapsed = bitwise_files(*paths, "xor")
+    rates["files"] = written / elapsed
+
+    return rates
+
+
+def run_verify(args):
+    """--verify: differential checks of every fast path plus throughput gates"""
+    parser = argparse.ArgumentParser(prog="--verify")
+    parser.add_argument("--cases", type=int, default=200)
+    parser.add_argument("--max-bits", type=int, default=512)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--baseline", default=VERIFY_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=VERIFY_TOLERANCE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--no-throughput-gates", action="store_true",
+                        help="check correctness only; a missing baseline is not a failure")
+    opts = parser.parse_args(args)
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication(sys.argv[:1])
+    win = BinaryCalculator()
+    failed = False
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        checks = [
+            ("expression", lambda rnd: check_expression(rnd, win, opts.max_bits)),
+            ("keys", lambda rnd: check_keys(rnd, win, opts.max_bits)),
+            ("history", lambda rnd: check_history(rnd, win, opts.max_bits)),
+            ("cache", lambda rnd: check_cache(rnd, win, opts.max_bits)),
+            ("pipeline", lambda rnd: check_pipeline(rnd, opts.max_bits)),
+            ("files", lambda rnd: check_files(rnd, tmpdir)),
+            ("fixed-point", lambda rnd: check_fixed_point(rnd, opts.max_bits)),
+            ("export", lambda rnd: check_export(rnd, tmpdir, opts.max_bits)),
+        ]
+        for name, check in checks:
+            try:
+                engine = _run_cases(check, opts.cases, opts.seed)
+                print(f"ok    {name} ({opts.cases} cases, {engine})")
+            except Exception as e:
+                # any exception is a regression; keep going with the other checks
+                failed = True
+                detail = e if isinstance(e, AssertionError) else f"{type(e).__name__}: {e}"
+                print(f"FAIL  {name}: {detail}")
+
+        win.frac_bits = DEFAULT_FRAC_BITS
+        rates = measure_throughput(win, tmpdir)
+
+    if opts.update_baseline:
+        with open(opts.baseline, "w", encoding="utf-8") as f:
+            json.dump(rates, f, indent=2, sort_keys=True)
+        print(f"baseline written to {opts.baseline}")
+        return 1 if failed else 0
+
+    baseline = {}
+    if opts.no_throughput_gates:
+        print("THROUGHPUT GATES OFF (--no-throughput-gates)")
+    elif os.path.exists(opts.baseline):
+        with open(opts.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    else:
+        failed = True
+        print(f"FAIL  THROUGHPUT GATES OFF: no baseline at {opts.baseline} "
+              f"(create one on this machine with --update-baseline, "
+              f"or pass --no-throughput-gates)")
+
+    for name, rate in sorted(rates.items()):
+        ref = baseline.get(name)
+        if ref is None:
+            if baseline:
+                failed = True
+                print(f"FAIL  {name}: {rate:.0f}/s, not in the baseline")
+            else:
+                print(f"      {name}: {rate:.0f}/s")
+            continue
+        ok = rate >= ref * (1 - opts.tolerance)
+        failed = failed or not ok
+        print(f"{'ok   ' if ok else 'SLOW '} {name}: {rate:.0f}/s (baseline {ref:.0f}/s)")
+    return 1 if failed else 0
+
+
+def _rss_kib():
+    """Current resident set size in KiB (Linux only, else None)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def run_session_bench(args):
+    """--bench-sessions [N]: time and memory cost of each extra session"""
+    count = int(args[0]) if args else 20
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication(sys.argv[:1])
+    tabs = SessionTabs()
+
+    tracemalloc.start()
+    heap0, rss0 = tracemalloc.get_traced_memory()[0], _rss_kib()
+    start = time.perf_counter()
+    for _ in range(count):
+        tabs.new_session()
+    elapsed = time.perf_counter() - start
+    heap = (tracemalloc.get_traced_memory()[0] - heap0) / count / 1024
+    tracemalloc.stop()
+    rss1 = _rss_kib()
+
+    print(f"{count} extra sessions: {elapsed / count * 1000:.2f} ms each, "
+          f"{heap:.1f} KiB Python heap each")
+    if rss0 is not None and rss1 is not None:
+        print(f"RSS growth: {(rss1 - rss0) / count:.1f} KiB per session")
+    return 0
+
+
 def main():
-    app = QApplication(sys.argv)
+    argv = sys.argv
+    options = {"--frac-bits": DEFAULT_FRAC_BITS, "--sessions": 1}
+    while len(argv) > 2 and argv[1] in options:
+        options[argv[1]] = int(argv[2])
+        argv = argv[:1] + argv[3:]
+
+    if len(argv) > 1 and argv[1] == "--files":
+        sys.exit(run_file_mode(argv[2:]))
+    if len(argv) > 1 and argv[1] == "--popcount":
+        sys.exit(run_popcount(argv[2:]))
+    if len(argv) > 1 and argv[1] == "--bench-backends":
+        sys.exit(run_backend_bench(argv[2:]))
+    if len(argv) > 1 and argv[1] == "--replay":
+        sys.exit(run_replay(argv[2:]))
+    if len(argv) > 1 and argv[1] == "--pipeline":
+        sys.exit(run_pipeline(argv[2:]))
+    if len(argv) > 1 and argv[1] == "--verify":
+        sys.exit(run_verify(argv[2:]))
+    if len(argv) > 1 and argv[1] == "--bench-sessions":
+        sys.exit(run_session_bench(argv[2:]))
+    if len(argv) > 1 and argv[1] == "--export":
+        sys.exit(run_export(argv[2:], options["--frac-bits"]))
+    if len(argv) > 1 and argv[1] == "--import":
+        sys.exit(run_import(argv[2:]))
+
+    app = QApplication(argv)
     app.setFont(QFont("Helvetica Neue", 14))
-    win = BinaryCalculator()
+    win = SessionTabs(options["--sessions"], options["--frac-bits"])
     win.show()
     sys.exit(app.exec_())
 
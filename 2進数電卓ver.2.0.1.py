@@ -1,12 +1,36 @@
+import os
 import sys
+import time
 from functools import partial
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont, QPalette, QColor
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
-    QLabel, QPushButton, QMessageBox, QStyleFactory, QSizePolicy
+    QLabel, QPushButton, QStyleFactory, QSizePolicy
 )
 
+# keyboard shortcuts (built once, not per key press)
+KEYMAP = {
+    Qt.Key_0: "0", Qt.Key_1: "1",
+    Qt.Key_Plus: "add", Qt.Key_Minus: "subtract",
+    Qt.Key_Asterisk: "multiply", Qt.Key_Slash: "divide",
+    Qt.Key_Equal: "equal", Qt.Key_Return: "equal", Qt.Key_Enter: "equal",
+    Qt.Key_Backspace: "back", Qt.Key_Delete: "clear",
+}
+
+# replay scripts: whitespace-separated key names, or keyboard characters
+KEY_NAMES = (
+    "and", "or", "xor", "back", "add", "subtract", "multiply", "divide",
+    "0", "1", "equal", "clear",
+)
+REPLAY_CHARS = {
+    "0": "0", "1": "1", "+": "add", "-": "subtract",
+    "*": "multiply", "/": "divide", "=": "equal",
+}
+
+# digit keys repaint the display at most once per frame
+DISPLAY_FRAME_MS = 16
+
 class BinaryCalculator(QWidget):
     def __init__(self):
         super().__init__()
@@ -16,6 +40,7 @@ class BinaryCalculator(QWidget):
         self.reset_state()
         self.current_theme = "dark"   # dark / light
         self.current_lang  = "EN"     # EN / JP
+        self.stats = {"errors": 0}
 
         self._init_ui()
         self.apply_theme()
@@ -48,6 +73,14 @@ class BinaryCalculator(QWidget):
         header.addWidget(self.btn_theme)
         header.addWidget(self.btn_lang)
         header.addStretch()
+
+        # status line: non-modal error messages, cleared by a single timer
+        self.status_display = QLabel("")
+        self.status_display.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        header.addWidget(self.status_display)
+        self.status_timer = QTimer(self)
+        self.status_timer.setSingleShot(True)
+        self.status_timer.timeout.connect(self.clear_status)
         vbox.addLayout(header)
 
         # display
@@ -85,6 +118,12 @@ class BinaryCalculator(QWidget):
 
         vbox.addLayout(grid)
 
+        # coalesced display updates for digit keys
+        self.display_timer = QTimer(self)
+        self.display_timer.setSingleShot(True)
+        self.display_timer.setInterval(DISPLAY_FRAME_MS)
+        self.display_timer.timeout.connect(self.update_display)
+
         self.last_result = ""
 
     # theme
@@ -99,6 +138,7 @@ class BinaryCalculator(QWidget):
         if self.current_theme == "dark":
             bg_color = "#121212"
             text_color = "white"
+            error_color = "#FF6B6B"
             self.btn_theme.setText("☀")
             digit_bg = "#2D2D2D"
             func_bg  = "#374955"
@@ -107,6 +147,7 @@ class BinaryCalculator(QWidget):
         else:
             bg_color = "#FFFFFF"
             text_color = "black"
+            error_color = "#D32F2F"
             self.btn_theme.setText("🌙")
             digit_bg = "#E0E0E0"
             func_bg  = "#D2E5F4"
@@ -130,6 +171,8 @@ class BinaryCalculator(QWidget):
             }}
         """)
 
+        self.status_display.setStyleSheet(f"QLabel {{ color: {error_color}; }}")
+
         # button styling
         for key, btn in self.buttons.items():
             if key == "equal":
@@ -172,6 +215,10 @@ class BinaryCalculator(QWidget):
 
     # input / calc
     def on_button(self, key):
+        if key not in ("0","1"):
+            # render pending digit input before another key reads or replaces it
+            self.flush_display()
+
         if key == "clear":
             self.reset_state()
             self.display.setText("0")
@@ -213,9 +260,14 @@ class BinaryCalculator(QWidget):
                 self.operand1 += key
             else:
                 self.operand2 += key
-            self.update_display()
+            self.update_display(coalesce=True)
 
-    def update_display(self):
+    def update_display(self, coalesce=False):
+        if coalesce:
+            if not self.display_timer.isActive():
+                self.display_timer.start()
+            return
+        self.display_timer.stop()
         if not self.operator:
             txt = self.operand1 or "0"
         else:
@@ -223,6 +275,10 @@ class BinaryCalculator(QWidget):
             txt = f"{self.operand1} {sym} {self.operand2 or ''}"
         self.display.setText(txt)
 
+    def flush_display(self):
+        if self.display_timer.isActive():
+            self.update_display()
+
     def op_symbol(self):
         return {
             "add":"+","subtract":"-","multiply":"×","divide":"÷",
@@ -253,38 +309,81 @@ class BinaryCalculator(QWidget):
             self.reset_state(keep_result=True)
 
         except ZeroDivisionError:
-            msg = {
+            self.show_error({
                 "EN": "Cannot divide by zero.",
                 "JP": "ゼロで割ることはできません。"
-            }[self.current_lang]
-            QMessageBox.critical(self, "Error", msg, QMessageBox.Close)
+            }[self.current_lang])
             self.last_result = ""
             self.reset_state()
 
         except ValueError:
-            msg = {
+            self.show_error({
                 "EN": "Invalid input.",
                 "JP": "無効な入力です。"
-            }[self.current_lang]
-            QMessageBox.critical(self, "Error", msg, QMessageBox.Close)
+            }[self.current_lang])
             self.last_result = ""
             self.reset_state()
 
+    def show_error(self, msg):
+        # status line instead of a modal dialog, so key events keep flowing
+        self.stats["errors"] += 1
+        self.status_display.setText(msg)
+        self.status_timer.start(3000)
+
+    def clear_status(self):
+        self.status_display.setText("")
+
     def keyPressEvent(self, event):
         # Optional: keyboard shortcuts
-        keymap = {
-            Qt.Key_0: "0", Qt.Key_1: "1",
-            Qt.Key_Plus: "add", Qt.Key_Minus: "subtract",
-            Qt.Key_Asterisk: "multiply", Qt.Key_Slash: "divide",
-            Qt.Key_Equal: "equal", Qt.Key_Return: "equal", Qt.Key_Enter: "equal",
-            Qt.Key_Backspace: "back", Qt.Key_Delete: "clear",
-        }
-        if event.key() in keymap:
-            self.on_button(keymap[event.key()])
+        key = KEYMAP.get(event.key())
+        if key is not None:
+            self.on_button(key)
         else:
             super().keyPressEvent(event)
 
+def parse_keys(text):
+    """Turn a replay script into a list of on_button keys"""
+    keys = []
+    for token in text.split():
+        if token in KEY_NAMES:
+            keys.append(token)
+            continue
+        for ch in token:
+            if ch not in REPLAY_CHARS:
+                raise ValueError(f"unknown key in replay script: {ch!r}")
+            keys.append(REPLAY_CHARS[ch])
+    return keys
+
+
+def run_replay(args):
+    """--replay <keyfile>: feed a key sequence through on_button headlessly"""
+    if len(args) != 1:
+        print("usage: --replay <keyfile>", file=sys.stderr)
+        return 2
+    with open(args[0], encoding="utf-8") as f:
+        keys = parse_keys(f.read())
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication(sys.argv[:1])
+    win = BinaryCalculator()
+
+    start = time.perf_counter()
+    for key in keys:
+        win.on_button(key)
+    win.flush_display()
+    elapsed = time.perf_counter() - start
+
+    rate = len(keys) / elapsed if elapsed > 0 else float("inf")
+    print(f"{len(keys)} keys in {elapsed:.3f}s ({rate:.0f} keys/s), "
+          f"errors: {win.stats['errors']}")
+    print(win.display.text())
+    return 0
+
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--replay":
+        sys.exit(run_replay(sys.argv[2:]))
+
     app = QApplication(sys.argv)
     app.setFont(QFont("Helvetica Neue", 14))
     win = BinaryCalculator()
@@ -0,0 +1,64 @@
+/*
+ * 2進数電卓: optional native kernels for bulk bitwise operations.
+ *
+ * Build next to the calculator scripts (the Stable build loads it with ctypes):
+ *   Linux:   cc -O3 -shared -fPIC -o bitops.so bitops.c
+ *   macOS:   cc -O3 -shared -fPIC -o bitops.dylib bitops.c
+ *   Windows: cl /O2 /LD bitops.c
+ * Without it the calculator falls back to NumPy or pure Python.
+ */
+#include <stddef.h>
+#include <stdint.h>
+#include <string.h>
+
+#ifdef _WIN32
+#define EXPORT __declspec(dllexport)
+#else
+#define EXPORT
+#endif
+
+#define BITOPS_KERNEL(name, OP)                                              \
+    EXPORT void name(const uint8_t *a, const uint8_t *b, uint8_t *out,       \
+                     size_t n)                                               \
+    {                                                                        \
+        size_t i = 0;                                                        \
+        for (; i + 8 <= n; i += 8) {                                         \
+            uint64_t x, y;                                                   \
+            memcpy(&x, a + i, 8);                                            \
+            memcpy(&y, b + i, 8);                                            \
+            x = x OP y;                                                      \
+            memcpy(out + i, &x, 8);                                          \
+        }                                                                    \
+        for (; i < n; i++)                                                   \
+            out[i] = a[i] OP b[i];                                           \
+    }
+
+BITOPS_KERNEL(bitops_and, &)
+BITOPS_KERNEL(bitops_or, |)
+BITOPS_KERNEL(bitops_xor, ^)
+
+static unsigned popcount64(uint64_t x)
+{
+#if defined(__GNUC__) || defined(__clang__)
+    return (unsigned)__builtin_popcountll(x);
+#else
+    x = x - ((x >> 1) & 0x5555555555555555ULL);
+    x = (x & 0x3333333333333333ULL) + ((x >> 2) & 0x3333333333333333ULL);
+    x = (x + (x >> 4)) & 0x0F0F0F0F0F0F0F0FULL;
+    return (unsigned)((x * 0x0101010101010101ULL) >> 56);
+#endif
+}
+
+EXPORT uint64_t bitops_popcount(const uint8_t *a, size_t n)
+{
+    uint64_t count = 0;
+    size_t i = 0;
+    for (; i + 8 <= n; i += 8) {
+        uint64_t x;
+        memcpy(&x, a + i, 8);
+        count += popcount64(x);
+    }
+    for (; i < n; i++)
+        count += popcount64(a[i]);
+    return count;
+}